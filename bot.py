@@ -5,9 +5,10 @@ from telegram.ext import Application, CommandHandler, MessageHandler, ContextTyp
 from telegram.constants import ParseMode
 import aiofiles
 
-from config import TELEGRAM_BOT_TOKEN, DB_JSON_PATH, UPLOADS_DIR, EXPORTS_DIR
+from config import TELEGRAM_BOT_TOKEN, DB_BACKEND, DB_BACKENDS, DB_JSON_PATH, DB_SQLITE_PATH, UPLOADS_DIR, EXPORTS_DIR
 from excel_handler import ExcelHandler
 from json_db import JsonDB
+from sqlite_db import SqliteDB
 from mistral_ai import MistralAIHandler
 
 # Настройка логирования
@@ -19,7 +20,17 @@ logger = logging.getLogger(__name__)
 
 # Инициализация компонентов
 excel_handler = ExcelHandler()
-db = JsonDB(DB_JSON_PATH)
+if DB_BACKEND not in DB_BACKENDS:
+    logger.warning(
+        f"Неизвестное значение DB_BACKEND={DB_BACKEND!r}, допустимые: {', '.join(sorted(DB_BACKENDS))}. "
+        "Используется JSON БД."
+    )
+
+if DB_BACKEND == "sqlite":
+    # Данные из существующей JSON БД переносятся, пока SQLite БД пуста
+    db = SqliteDB(DB_SQLITE_PATH, import_json_path=DB_JSON_PATH)
+else:
+    db = JsonDB(DB_JSON_PATH)
 mistral_handler = None
 
 # Создание директорий
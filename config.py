@@ -11,9 +11,14 @@ MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY", "")
 
 # Пути к файлам
 DB_JSON_PATH = "database.json"
+DB_SQLITE_PATH = "database.sqlite"
 UPLOADS_DIR = "uploads"
 EXPORTS_DIR = "exports"
 
+# Хранилище данных: "json" или "sqlite"
+DB_BACKENDS = {"json", "sqlite"}
+DB_BACKEND = os.getenv("DB_BACKEND", "json").lower()
+
 # Модель Mistral
 MISTRAL_MODEL = "mistral-large-latest"
 
@@ -7,6 +7,8 @@ import aiofiles
 class JsonDB:
     """Класс для работы с JSON базой данных"""
     
+    AGGREGATE_FUNCTIONS = {"count", "sum", "avg", "min", "max"}
+    
     def __init__(self, db_path: str = "database.json"):
         self.db_path = db_path
         self._ensure_db_exists()
@@ -121,5 +123,109 @@ class JsonDB:
             await self.write(db)
         else:
             raise IndexError(f"Индекс строки {row_index} вне диапазона")
-
+    
+    @staticmethod
+    def _matches(row: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+        """Проверяет, что поля строки равны заданным значениям"""
+        if not filters:
+            return True
+        for field_name, value in filters.items():
+            if row.get(field_name) != value:
+                return False
+        return True
+    
+    async def filter_rows(self, sheet_name: str, filters: Optional[Dict[str, Any]] = None,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Возвращает строки листа, у которых поля равны заданным значениям
+        
+        Args:
+            sheet_name: Название листа
+            filters: Словарь поле -> значение (None соответствует пустой ячейке)
+            limit: Максимальное количество строк
+            
+        Returns:
+            Список подходящих строк
+        """
+        sheet_data = await self.get_sheet_data(sheet_name)
+        if sheet_data is None:
+            raise ValueError(f"Лист {sheet_name} не существует")
+        
+        result = [row for row in sheet_data if self._matches(row, filters)]
+        return result if limit is None else result[:limit]
+    
+    async def aggregate(self, sheet_name: str, func: str, field_name: Optional[str] = None,
+                        filters: Optional[Dict[str, Any]] = None,
+                        group_by: Optional[str] = None) -> Any:
+        """
+        Вычисляет агрегат по полю листа
+        
+        Args:
+            sheet_name: Название листа
+            func: Агрегатная функция (count, sum, avg, min, max)
+            field_name: Поле для агрегации (для count можно не указывать)
+            filters: Словарь поле -> значение для отбора строк
+            group_by: Поле для группировки
+            
+        Returns:
+            Значение агрегата или словарь группа -> значение при group_by
+        """
+        func = func.lower()
+        if func not in self.AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Неподдерживаемая агрегатная функция: {func}")
+        if field_name is None and func != "count":
+            raise ValueError(f"Для функции {func} необходимо указать поле")
+        
+        rows = await self.filter_rows(sheet_name, filters)
+        
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in rows:
+            key = row.get(group_by) if group_by is not None else None
+            if isinstance(key, (dict, list)):
+                raise ValueError(f"Нельзя группировать по полю {group_by}: значение {key!r} не является скаляром")
+            groups.setdefault(key, []).append(row)
+        
+        results = {key: self._aggregate_rows(group_rows, func, field_name)
+                   for key, group_rows in groups.items()}
+        if group_by is not None:
+            return results
+        return results.get(None, self._aggregate_rows([], func, field_name))
+    
+    @staticmethod
+    def _is_number(value: Any) -> bool:
+        """Проверяет, что значение является числом (bool числом не считается)"""
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    
+    @staticmethod
+    def _order_key(value: Any):
+        """Ключ сравнения для min/max: числа меньше строк"""
+        return (isinstance(value, str), value)
+    
+    @classmethod
+    def _aggregate_rows(cls, rows: List[Dict[str, Any]], func: str, field_name: Optional[str]) -> Any:
+        """
+        Вычисляет агрегат по списку строк
+        
+        count считает непустые значения, sum и avg учитывают только числа,
+        min и max сравнивают только числа и строки (числа меньше строк).
+        """
+        if field_name is None:
+            return len(rows)
+        
+        values = [row.get(field_name) for row in rows if row.get(field_name) is not None]
+        if func == "count":
+            return len(values)
+        if func in ("min", "max"):
+            comparable = [value for value in values if cls._is_number(value) or isinstance(value, str)]
+            if not comparable:
+                return None
+            if func == "min":
+                return min(comparable, key=cls._order_key)
+            return max(comparable, key=cls._order_key)
+        
+        numbers = [value for value in values if cls._is_number(value)]
+        if not numbers:
+            return None
+        total = sum(numbers)
+        return total if func == "sum" else total / len(numbers)
 
@@ -0,0 +1,426 @@
+import asyncio
+import datetime
+import json
+import math
+import os
+import sqlite3
+from contextlib import closing
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class SqliteDB:
+    """
+    Класс для работы с SQLite базой данных.
+
+    Повторяет асинхронный интерфейс JsonDB, но хранит каждый лист в отдельной
+    таблице: изменение одной строки не требует перезаписи всей БД, а фильтрация
+    и агрегация выполняются средствами SQL.
+    """
+
+    AGGREGATE_FUNCTIONS = {"count", "sum", "avg", "min", "max"}
+    # Типы JSON-значений, которые учитывают агрегатные функции (как в JsonDB)
+    AGGREGATE_TYPES = {
+        "count": None,
+        "sum": ("integer", "real"),
+        "avg": ("integer", "real"),
+        "min": ("integer", "real", "text"),
+        "max": ("integer", "real", "text"),
+    }
+    JSON_IMPORT_MIGRATION = "json_import"
+
+    def __init__(self, db_path: str = "database.sqlite", import_json_path: Optional[str] = None):
+        """
+        Args:
+            db_path: Путь к файлу SQLite
+            import_json_path: Путь к JSON БД, данные из которой импортируются,
+                пока импорт не завершился успешно и в SQLite нет листов
+        """
+        self.db_path = db_path
+        self._ensure_db_exists()
+        if import_json_path and os.path.exists(import_json_path):
+            self._import_json_sync(import_json_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с БД"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_db_exists(self):
+        """Создает служебные таблицы, если они не существуют"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _sheets ("
+                "name TEXT PRIMARY KEY, table_name TEXT NOT NULL UNIQUE)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _metadata ("
+                "key TEXT PRIMARY KEY, value TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _migrations ("
+                "name TEXT PRIMARY KEY, applied_at TEXT NOT NULL)"
+            )
+
+    @classmethod
+    def _needs_json_import(cls, conn: sqlite3.Connection) -> bool:
+        """Проверяет, что импорт JSON БД не выполнялся и листов еще нет"""
+        migrated = conn.execute(
+            "SELECT 1 FROM _migrations WHERE name = ?", (cls.JSON_IMPORT_MIGRATION,)
+        ).fetchone()
+        has_sheets = conn.execute("SELECT 1 FROM _sheets LIMIT 1").fetchone()
+        return not migrated and not has_sheets
+
+    async def _run(self, func, *args):
+        """Выполняет операцию с БД в отдельном потоке одной транзакцией"""
+        def runner():
+            with closing(self._connect()) as conn, conn:
+                # Чтение и запись должны быть атомарны: иначе параллельная операция
+                # может сдвинуть индексы строк или создать тот же лист
+                conn.execute("BEGIN IMMEDIATE")
+                return func(conn, *args)
+
+        try:
+            return await asyncio.to_thread(runner)
+        except (IndexError, ValueError):
+            raise
+        except Exception as e:
+            raise Exception(f"Ошибка при работе с БД: {str(e)}")
+
+    @classmethod
+    def _sanitize(cls, value: Any) -> Any:
+        """Заменяет NaN и бесконечности на None, чтобы JSON был валиден для SQLite"""
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        if isinstance(value, dict):
+            return {key: cls._sanitize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls._sanitize(item) for item in value]
+        return value
+
+    @classmethod
+    def _dump(cls, value: Any) -> str:
+        return json.dumps(cls._sanitize(value), ensure_ascii=False, allow_nan=False, default=str)
+
+    @staticmethod
+    def _has_sql_path(field_name: str) -> bool:
+        """Проверяет, что имя поля можно безопасно передать в JSON-путь SQLite"""
+        return '"' not in field_name and "\\" not in field_name
+
+    @classmethod
+    def _field_path(cls, field_name: str) -> str:
+        """Формирует JSON-путь к полю строки"""
+        if not cls._has_sql_path(field_name):
+            raise ValueError(
+                f"Имя поля {field_name!r} содержит символы, не поддерживаемые в запросах SQLite"
+            )
+        return f'$."{field_name}"'
+
+    @staticmethod
+    def _get_table(conn: sqlite3.Connection, sheet_name: str) -> Optional[str]:
+        row = conn.execute(
+            "SELECT table_name FROM _sheets WHERE name = ?", (sheet_name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @classmethod
+    def _ensure_table(cls, conn: sqlite3.Connection, sheet_name: str) -> str:
+        """Возвращает таблицу листа, создавая ее при необходимости"""
+        table = cls._get_table(conn, sheet_name)
+        if table:
+            return table
+
+        cursor = conn.execute(
+            "INSERT INTO _sheets (name, table_name) VALUES (?, '')", (sheet_name,)
+        )
+        table = f"sheet_{cursor.lastrowid}"
+        conn.execute(
+            "UPDATE _sheets SET table_name = ? WHERE name = ?", (table, sheet_name)
+        )
+        conn.execute(
+            f'CREATE TABLE "{table}" ('
+            "row_id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+        )
+        return table
+
+    @classmethod
+    def _replace_rows(cls, conn: sqlite3.Connection, sheet_name: str, rows: List[Dict[str, Any]]):
+        """Полностью заменяет строки листа"""
+        table = cls._ensure_table(conn, sheet_name)
+        conn.execute(f'DELETE FROM "{table}"')
+        conn.executemany(
+            f'INSERT INTO "{table}" (data) VALUES (?)',
+            ((cls._dump(row),) for row in rows)
+        )
+
+    @staticmethod
+    def _row_id_at(conn: sqlite3.Connection, table: str, row_index: int) -> Optional[int]:
+        """Находит row_id строки по ее порядковому индексу"""
+        if row_index < 0:
+            return None
+        row = conn.execute(
+            f'SELECT row_id FROM "{table}" ORDER BY row_id LIMIT 1 OFFSET ?',
+            (row_index,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _load_rows(conn: sqlite3.Connection, table: str) -> List[Dict[str, Any]]:
+        cursor = conn.execute(f'SELECT data FROM "{table}" ORDER BY row_id')
+        return [json.loads(data) for (data,) in cursor]
+
+    @classmethod
+    def _write_metadata(cls, conn: sqlite3.Connection, metadata: Dict[str, Any]):
+        conn.execute("DELETE FROM _metadata")
+        conn.executemany(
+            "INSERT INTO _metadata (key, value) VALUES (?, ?)",
+            ((key, cls._dump(value)) for key, value in metadata.items())
+        )
+
+    def _import_json_sync(self, json_path: str):
+        """Синхронный импорт JSON БД (для инициализации)"""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if not self._needs_json_import(conn):
+                    return
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._import_data(conn, data)
+        except Exception as e:
+            raise Exception(f"Ошибка при импорте JSON БД {json_path}: {str(e)}")
+
+    @classmethod
+    def _import_data(cls, conn: sqlite3.Connection, data: Dict[str, Any]):
+        """Импортирует данные и отмечает миграцию в той же транзакции"""
+        for sheet_name, rows in data.get("sheets", {}).items():
+            cls._replace_rows(conn, sheet_name, rows or [])
+        cls._write_metadata(conn, data.get("metadata") or {})
+        conn.execute(
+            "INSERT OR REPLACE INTO _migrations (name, applied_at) VALUES (?, ?)",
+            (cls.JSON_IMPORT_MIGRATION, datetime.datetime.now().isoformat())
+        )
+
+    async def import_from_json(self, json_path: str):
+        """
+        Импортирует данные из JSON БД (формат JsonDB)
+
+        Args:
+            json_path: Путь к файлу database.json
+        """
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            raise Exception(f"Ошибка при чтении JSON БД: {str(e)}")
+
+        await self._run(self._import_data, data)
+
+    async def save_excel_data(self, excel_data: Dict[str, List[Dict[str, Any]]], source_file: Optional[str] = None):
+        """
+        Сохраняет данные из Excel в БД
+
+        Args:
+            excel_data: Словарь с данными из Excel (лист -> список строк)
+            source_file: Название исходного файла
+        """
+        def save(conn):
+            for sheet_name, rows in excel_data.items():
+                self._replace_rows(conn, sheet_name, rows)
+            self._write_metadata(conn, {
+                "last_updated": datetime.datetime.now().isoformat(),
+                "source_file": source_file
+            })
+
+        await self._run(save)
+
+    async def get_all_data(self) -> Dict[str, Any]:
+        """Возвращает все данные из БД"""
+        def load(conn):
+            sheets = {
+                name: self._load_rows(conn, table)
+                for name, table in conn.execute(
+                    "SELECT name, table_name FROM _sheets ORDER BY rowid"
+                ).fetchall()
+            }
+            metadata = {
+                key: json.loads(value)
+                for key, value in conn.execute("SELECT key, value FROM _metadata")
+            }
+            return {"sheets": sheets, "metadata": metadata}
+
+        return await self._run(load)
+
+    async def get_sheet_data(self, sheet_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Возвращает данные конкретного листа"""
+        def load(conn):
+            table = self._get_table(conn, sheet_name)
+            return self._load_rows(conn, table) if table else None
+
+        return await self._run(load)
+
+    async def update_sheet_data(self, sheet_name: str, data: List[Dict[str, Any]]):
+        """Обновляет данные листа"""
+        await self._run(self._replace_rows, sheet_name, data)
+
+    async def update_field(self, sheet_name: str, row_index: int, field_name: str, new_value: Any):
+        """Обновляет конкретное поле в конкретной строке"""
+        def update(conn):
+            table = self._ensure_table(conn, sheet_name)
+            row_id = self._row_id_at(conn, table, row_index)
+            if row_id is None:
+                raise IndexError(f"Индекс строки {row_index} вне диапазона")
+            if self._has_sql_path(field_name):
+                conn.execute(
+                    f'UPDATE "{table}" SET data = json_set(data, ?, json(?)) WHERE row_id = ?',
+                    (self._field_path(field_name), self._dump(new_value), row_id)
+                )
+                return
+
+            # Такое имя поля нельзя выразить JSON-путем SQLite - обновляем строку целиком
+            (data,) = conn.execute(
+                f'SELECT data FROM "{table}" WHERE row_id = ?', (row_id,)
+            ).fetchone()
+            row = json.loads(data)
+            row[field_name] = new_value
+            conn.execute(
+                f'UPDATE "{table}" SET data = ? WHERE row_id = ?', (self._dump(row), row_id)
+            )
+
+        await self._run(update)
+
+    async def add_row(self, sheet_name: str, row_data: Dict[str, Any]):
+        """Добавляет новую строку в лист"""
+        def add(conn):
+            table = self._ensure_table(conn, sheet_name)
+            conn.execute(f'INSERT INTO "{table}" (data) VALUES (?)', (self._dump(row_data),))
+
+        await self._run(add)
+
+    async def delete_row(self, sheet_name: str, row_index: int):
+        """Удаляет строку из листа"""
+        def delete(conn):
+            table = self._get_table(conn, sheet_name)
+            if table is None:
+                raise ValueError(f"Лист {sheet_name} не существует")
+            row_id = self._row_id_at(conn, table, row_index)
+            if row_id is None:
+                raise IndexError(f"Индекс строки {row_index} вне диапазона")
+            conn.execute(f'DELETE FROM "{table}" WHERE row_id = ?', (row_id,))
+
+        await self._run(delete)
+
+    def _where_clause(self, filters: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """Формирует условие WHERE по равенству полей"""
+        if not filters:
+            return "", []
+
+        conditions = []
+        params = []
+        for field_name, value in filters.items():
+            if value is None:
+                conditions.append("json_extract(data, ?) IS NULL")
+                params.append(self._field_path(field_name))
+            else:
+                conditions.append("json_extract(data, ?) = json_extract(?, '$')")
+                params.extend([self._field_path(field_name), self._dump(value)])
+        return " WHERE " + " AND ".join(conditions), params
+
+    @staticmethod
+    def _group_key(group_by: str, key: Any, json_type: Optional[str]) -> Any:
+        """Восстанавливает Python-значение ключа группы по его JSON-типу"""
+        if json_type == "true":
+            return True
+        if json_type == "false":
+            return False
+        if json_type in ("object", "array"):
+            raise ValueError(f"Нельзя группировать по полю {group_by}: значение {key!r} не является скаляром")
+        return key
+
+    async def filter_rows(self, sheet_name: str, filters: Optional[Dict[str, Any]] = None,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Возвращает строки листа, у которых поля равны заданным значениям
+
+        Args:
+            sheet_name: Название листа
+            filters: Словарь поле -> значение (None соответствует пустой ячейке)
+            limit: Максимальное количество строк
+
+        Returns:
+            Список подходящих строк
+        """
+        def select(conn):
+            table = self._get_table(conn, sheet_name)
+            if table is None:
+                raise ValueError(f"Лист {sheet_name} не существует")
+            where, params = self._where_clause(filters)
+            query = f'SELECT data FROM "{table}"{where} ORDER BY row_id'
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            return [json.loads(data) for (data,) in conn.execute(query, params)]
+
+        return await self._run(select)
+
+    async def aggregate(self, sheet_name: str, func: str, field_name: Optional[str] = None,
+                        filters: Optional[Dict[str, Any]] = None,
+                        group_by: Optional[str] = None) -> Any:
+        """
+        Вычисляет агрегат по полю листа
+
+        Args:
+            sheet_name: Название листа
+            func: Агрегатная функция (count, sum, avg, min, max)
+            field_name: Поле для агрегации (для count можно не указывать)
+            filters: Словарь поле -> значение для отбора строк
+            group_by: Поле для группировки
+
+        Returns:
+            Значение агрегата или словарь группа -> значение при group_by
+        """
+        func = func.lower()
+        if func not in self.AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Неподдерживаемая агрегатная функция: {func}")
+        if field_name is None and func != "count":
+            raise ValueError(f"Для функции {func} необходимо указать поле")
+
+        def select(conn):
+            table = self._get_table(conn, sheet_name)
+            if table is None:
+                raise ValueError(f"Лист {sheet_name} не существует")
+
+            select_params = []
+            if field_name is None:
+                expression = "COUNT(*)"
+            elif self.AGGREGATE_TYPES[func] is None:
+                expression = f"{func.upper()}(json_extract(data, ?))"
+                select_params.append(self._field_path(field_name))
+            else:
+                types = ", ".join(f"'{json_type}'" for json_type in self.AGGREGATE_TYPES[func])
+                expression = (
+                    f"{func.upper()}(CASE WHEN json_type(data, ?) IN ({types}) "
+                    "THEN json_extract(data, ?) END)"
+                )
+                select_params.extend([self._field_path(field_name)] * 2)
+            where, where_params = self._where_clause(filters)
+
+            if group_by is None:
+                query = f'SELECT {expression} FROM "{table}"{where}'
+                return conn.execute(query, select_params + where_params).fetchone()[0]
+
+            # Тип ключа группы берется из первой строки группы, как в JsonDB
+            group_path = self._field_path(group_by)
+            query = (
+                f'SELECT g.grp, (SELECT json_type(data, ?) FROM "{table}" WHERE row_id = g.first_row), g.value '
+                f'FROM (SELECT json_extract(data, ?) AS grp, MIN(row_id) AS first_row, {expression} AS value '
+                f'FROM "{table}"{where} GROUP BY grp) AS g ORDER BY g.first_row'
+            )
+            params = [group_path, group_path] + select_params + where_params
+            return {
+                self._group_key(group_by, key, json_type): value
+                for key, json_type, value in conn.execute(query, params)
+            }
+
+        return await self._run(select)
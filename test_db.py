@@ -0,0 +1,183 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from json_db import JsonDB
+from sqlite_db import SqliteDB
+
+
+ROWS = [
+    {"Имя": "А", "Город": "М", "p": "abc", "flag": True},
+    {"Имя": "Б", "Город": "М", "p": 10, "flag": False},
+    {"Имя": "В", "Город": "С", "p": "7", "flag": True},
+    {"Имя": "Г", "Город": None, "p": {"x": 1}, "flag": True},
+    {"Имя": "Д", "Город": "С", "p": 2.5},
+]
+
+
+class BackendContractMixin:
+    """Одинаковые проверки для JsonDB и SqliteDB"""
+
+    def make_db(self):
+        raise NotImplementedError
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = self.make_db()
+        await self.db.save_excel_data({"S": [dict(row) for row in ROWS]}, source_file="f.xlsx")
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    async def test_crud(self):
+        await self.db.update_field("S", 1, "Имя", "Z")
+        await self.db.delete_row("S", 0)
+        await self.db.add_row("S", {"Имя": "Е"})
+        rows = await self.db.get_sheet_data("S")
+        self.assertEqual([row["Имя"] for row in rows], ["Z", "В", "Г", "Д", "Е"])
+
+        await self.db.add_row("New", {"a": 1})
+        self.assertEqual(await self.db.get_sheet_data("New"), [{"a": 1}])
+        self.assertIsNone(await self.db.get_sheet_data("Missing"))
+
+        data = await self.db.get_all_data()
+        self.assertEqual(list(data["sheets"]), ["S", "New"])
+        self.assertEqual(data["metadata"]["source_file"], "f.xlsx")
+
+    async def test_crud_errors(self):
+        with self.assertRaises(IndexError):
+            await self.db.update_field("S", 99, "Имя", "Z")
+        with self.assertRaises(IndexError):
+            await self.db.delete_row("S", -1)
+        with self.assertRaises(ValueError):
+            await self.db.delete_row("Missing", 0)
+
+    async def test_filter_rows(self):
+        rows = await self.db.filter_rows("S", {"Город": "С"})
+        self.assertEqual([row["Имя"] for row in rows], ["В", "Д"])
+        rows = await self.db.filter_rows("S", {"Город": None})
+        self.assertEqual([row["Имя"] for row in rows], ["Г"])
+        rows = await self.db.filter_rows("S", {"flag": None})
+        self.assertEqual([row["Имя"] for row in rows], ["Д"])
+        rows = await self.db.filter_rows("S", {"Город": "М"}, limit=1)
+        self.assertEqual([row["Имя"] for row in rows], ["А"])
+        with self.assertRaises(ValueError):
+            await self.db.filter_rows("Missing")
+
+    async def test_aggregate_mixed_types(self):
+        self.assertEqual(await self.db.aggregate("S", "count"), 5)
+        self.assertEqual(await self.db.aggregate("S", "count", "Город"), 4)
+        self.assertEqual(await self.db.aggregate("S", "sum", "p"), 12.5)
+        self.assertAlmostEqual(await self.db.aggregate("S", "avg", "p"), 6.25)
+        self.assertEqual(await self.db.aggregate("S", "min", "p"), 2.5)
+        self.assertEqual(await self.db.aggregate("S", "max", "p"), "abc")
+        self.assertIsNone(await self.db.aggregate("S", "sum", "Имя"))
+        self.assertIsNone(await self.db.aggregate("S", "max", "missing"))
+        self.assertEqual(await self.db.aggregate("S", "count", filters={"Город": "М"}), 2)
+
+    async def test_aggregate_group_by(self):
+        self.assertEqual(
+            await self.db.aggregate("S", "count", group_by="Город"),
+            {"М": 2, "С": 2, None: 1}
+        )
+        self.assertEqual(
+            await self.db.aggregate("S", "sum", "p", group_by="flag"),
+            {True: None, False: 10, None: 2.5}
+        )
+        with self.assertRaises(ValueError):
+            await self.db.aggregate("S", "count", group_by="p")
+
+    async def test_aggregate_errors(self):
+        with self.assertRaises(ValueError):
+            await self.db.aggregate("S", "median", "p")
+        with self.assertRaises(ValueError):
+            await self.db.aggregate("S", "sum")
+
+
+class JsonDBTest(BackendContractMixin, unittest.IsolatedAsyncioTestCase):
+    def make_db(self):
+        return JsonDB(os.path.join(self.tmp.name, "database.json"))
+
+
+class SqliteDBTest(BackendContractMixin, unittest.IsolatedAsyncioTestCase):
+    def make_db(self):
+        return SqliteDB(os.path.join(self.tmp.name, "database.sqlite"))
+
+    async def test_nan_is_stored_as_null(self):
+        await self.db.update_field("S", 0, "p", float("nan"))
+        await self.db.add_row("S", {"p": float("inf")})
+        rows = await self.db.get_sheet_data("S")
+        self.assertIsNone(rows[0]["p"])
+        self.assertIsNone(rows[-1]["p"])
+        self.assertEqual(len(await self.db.filter_rows("S", {"p": None})), 2)
+
+    async def test_concurrent_writes_to_new_sheet(self):
+        await asyncio.gather(*(self.db.add_row("New", {"n": n}) for n in range(20)))
+        rows = await self.db.get_sheet_data("New")
+        self.assertEqual(sorted(row["n"] for row in rows), list(range(20)))
+
+    async def test_field_name_without_sql_path(self):
+        await self.db.add_row("Q", {'q"x': 1, "a\\b": 2})
+        await self.db.update_field("Q", 0, 'q"x', 99)
+        await self.db.update_field("Q", 0, "a\\b", 3)
+        self.assertEqual(await self.db.get_sheet_data("Q"), [{'q"x': 99, "a\\b": 3}])
+        with self.assertRaises(ValueError):
+            await self.db.filter_rows("Q", {'q"x': 99})
+        with self.assertRaises(ValueError):
+            await self.db.aggregate("Q", "sum", "a\\b")
+
+
+class SqliteJsonImportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, "database.json")
+        self.sqlite_path = os.path.join(self.tmp.name, "database.sqlite")
+        self.data = {
+            "sheets": {"S": [dict(row) for row in ROWS]},
+            "metadata": {"last_updated": "2024-01-01T00:00:00", "source_file": "f.xlsx"},
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_json(self, content: str):
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def sheet_names(self):
+        with sqlite3.connect(self.sqlite_path) as conn:
+            return [name for (name,) in conn.execute("SELECT name FROM _sheets")]
+
+    def test_import(self):
+        self.write_json(json.dumps(self.data, ensure_ascii=False))
+        SqliteDB(self.sqlite_path, import_json_path=self.json_path)
+        self.assertEqual(self.sheet_names(), ["S"])
+
+    def test_import_runs_once(self):
+        self.write_json(json.dumps(self.data, ensure_ascii=False))
+        SqliteDB(self.sqlite_path, import_json_path=self.json_path)
+        self.write_json(json.dumps({"sheets": {"Other": []}}))
+        SqliteDB(self.sqlite_path, import_json_path=self.json_path)
+        self.assertEqual(self.sheet_names(), ["S"])
+
+    def test_retry_after_failed_import(self):
+        self.write_json('{"sheets": {')
+        with self.assertRaises(Exception):
+            SqliteDB(self.sqlite_path, import_json_path=self.json_path)
+
+        # Ошибка посреди импорта откатывает уже записанные листы
+        self.write_json(json.dumps({"sheets": {"A": [{"x": 1}], "B": 5}}))
+        with self.assertRaises(Exception):
+            SqliteDB(self.sqlite_path, import_json_path=self.json_path)
+        self.assertEqual(self.sheet_names(), [])
+
+        self.write_json(json.dumps(self.data, ensure_ascii=False))
+        SqliteDB(self.sqlite_path, import_json_path=self.json_path)
+        self.assertEqual(self.sheet_names(), ["S"])
+
+
+if __name__ == '__main__':
+    unittest.main()